@@ -1,20 +1,22 @@
 import asyncio
 import aiohttp
-import waybackpy
+import aiodns
 import logging
-import json
+import orjson
 import os
 import re
+import shutil
 import subprocess
-import requests
 import sys
 import argparse
+import csv
 from urllib.parse import urlparse, urljoin, parse_qs
 from datetime import datetime
 from rich.console import Console
 from rich.progress import Progress, TextColumn, BarColumn, TimeRemainingColumn
 from rich.table import Table
 from PIL import Image
+from yarl import URL
 
 console = Console()
 logging.basicConfig(
@@ -23,31 +25,125 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+SCRIPT_SRC_RE = re.compile(r'<script[^>]+src=["\'](.*?)["\']', re.IGNORECASE)
+JS_ENDPOINT_RE = re.compile(
+    r'[\'"](?P<u>(?:https?://|/|api/|graphql/|ws://)[^"\']+?|[^"\']+?\?[^"\']+?|'
+    r'[^"\']+?/[a-zA-Z0-9_-]+?/[0-9a-zA-Z_-]+?)[\'"]'
+)
+REDIRECT_RE = re.compile(r'https?://(www\.)?evil\.com')
+PATHTRAVERSAL_RE = re.compile(r'root:|\[extensions\]')
+XSS_RE = re.compile(r'alert\(1\)|onerror', re.IGNORECASE)
+SSTI_RE = re.compile(r'(?<!\d)(49|7777777)(?!\d)')
+
+MAX_HTML_BYTES = 2_000_000  # Sayfa gövdesinden okunacak en fazla byte
+MAX_JS_BYTES = 2_000_000  # JS dosyasından okunacak en fazla byte
+
+WAYBACK_PAGE_SIZE = 10000  # CDX API'den sayfa başına alınacak satır sayısı
+
+MAX_TABLE_ROWS = 200  # Bu sayıdan büyük tablolar (--table verilmedikçe) konsola basılmaz
+
+HEADERS = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
+RANGE_HEADERS = {"Range": "bytes=0-0"}  # Gövdenin yalnızca ilk byte'ı
+
+# Yavaş bağlantı ve gövdeler tüm süreyi tek başına tüketmesin diye ayrı sınırlar
+# (connect, havuzda boş bağlantı beklemeyi de kapsadığı için kullanılmaz; sock_connect yeterli)
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=20, sock_connect=5, sock_read=10)
+
 class Tulpar:
-    def __init__(self, domain, output_dir="output"):
+    def __init__(self, domain, output_dir="output", verbose=False, show_tables=False):
         self.domain = domain
+        self.verbose = verbose
+        self.show_tables = show_tables
+        self._domain_lower = domain.lower()
+        self._domain_suffix = "." + self._domain_lower
         self.output_dir = output_dir
-        self.rate_limit = 0.5  # Sabit rate limit
+        self.concurrency = 20  # Aynı anda en fazla istek sayısı
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.dns_concurrency = 100  # Aynı anda en fazla DNS sorgusu
         self.subfinder_timeout = 300  # Sabit 5 dakika
         self.subdomains = set()
+        self.resolved_subdomains = set()
         self.live_subdomains = set()
         self.endpoints = set()
-        self.js_endpoints = []
+        self.js_endpoints = {}  # url -> query
+        self._fetched_js = set()
+        self._ssti_controls = {}  # kontrol URL'i -> SSTI_RE eşleşmesi (Task)
         self.vulnerabilities = []
         self.screenshots = {}
         os.makedirs(self.output_dir, exist_ok=True)
+        # Tüm screenshot'lar aynı boş görsel olduğu için bir kez üretilip kopyalanır
+        self._placeholder = os.path.join(self.output_dir, "_placeholder.png")
+        Image.new("RGB", (800, 600), color="white").save(self._placeholder)
         self.start_time = datetime.now()
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.output_base = f"{self.output_dir}/tulpar_output_{self.domain}_{timestamp}"
         logging.info(f"Tulpar başlatıldı, hedef: {self.domain}")
 
+    def _belongs(self, hostname):
+        # urlparse(...).hostname: port içermez, küçük harflidir; host yoksa None döner
+        if not hostname:
+            return False
+        return hostname == self._domain_lower or hostname.endswith(self._domain_suffix)
+
+    @staticmethod
+    def _js_endpoint_data(url, query):
+        param_names = list(parse_qs(query).keys())
+        return {
+            "url": url,
+            "parameters": len(param_names),
+            "param_names": param_names
+        }
+
+    @staticmethod
+    async def _read_text(resp, limit):
+        raw = bytearray()
+        while len(raw) < limit:
+            chunk = await resp.content.read(limit - len(raw))
+            if not chunk:
+                break
+            raw.extend(chunk)
+        try:
+            return raw.decode(resp.charset or "utf-8", "replace")
+        except LookupError:
+            # Sunucu bilinmeyen bir charset bildirdi
+            return raw.decode("utf-8", "replace")
+
+    @staticmethod
+    def _read_lines(path):
+        with open(path, "r") as f:
+            return [line for line in (raw.strip() for raw in f) if line]
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+    @staticmethod
+    def _write_csv(path, header, rows):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
     async def run(self):
         console.print("[bold yellow]emrewashere: created by Emre İşlek - Tulpar V1[/bold yellow]")
         console.print(f"[bold yellow]Tulpar çalışıyor, hedef: {self.domain}[/bold yellow]")
         logging.info("Tulpar çalışmaya başladı.")
         await self.enumerate_subdomains()
-        await self.check_live_subdomains()
-        await self.collect_js_endpoints()
-        await self.test_vulnerabilities()
-        await self.collect_wayback_endpoints()
+        await self.resolve_subdomains()
+        connector = aiohttp.TCPConnector(
+            limit=100, limit_per_host=10, ssl=False, ttl_dns_cache=300,
+            resolver=aiohttp.AsyncResolver()
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=DEFAULT_TIMEOUT
+        ) as session:
+            await self.check_live_subdomains(session)
+            await self.collect_js_endpoints(session)
+            await self.test_vulnerabilities(session)
+            await self.collect_wayback_endpoints(session)
         await self.save_results()
         self.display_results()
         console.print("[bold yellow]Tulpar tamamlandı![/bold yellow]")
@@ -68,7 +164,8 @@ class Tulpar:
                 BarColumn(),
                 TimeRemainingColumn(),
                 console=console,
-                transient=True
+                transient=True,
+                refresh_per_second=4
             ) as progress:
                 task = progress.add_task("Subfinder taranıyor", total=None)
                 process = await asyncio.create_subprocess_exec(
@@ -76,20 +173,27 @@ class Tulpar:
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE
                 )
+                lines_read = 0
+                buffer = b""
                 try:
                     async with asyncio.timeout(self.subfinder_timeout):
                         while True:
-                            line = await process.stdout.readline()
-                            if not line:
+                            chunk = await process.stdout.read(65536)
+                            if not chunk:
                                 break
-                            line = line.decode().strip()
-                            if line:
-                                console.print(f"[cyan]Subfinder Çıktısı: {line}[/cyan]")
-                                logging.info(f"Subfinder çıktısı: {line}")
-                                if line.endswith(self.domain):
-                                    self.subdomains.add(line)
-                                    console.print(f"[cyan]Subfinder Bulundu: {line}[/cyan]")
-                                    logging.info(f"Subfinder subdomain bulundu: {line}")
+                            complete, _, buffer = (buffer + chunk).rpartition(b"\n")
+                            if not complete:
+                                continue
+                            lines = complete.decode(errors="replace").split("\n")
+                            self._add_subfinder_lines(lines)
+                            previous = lines_read
+                            lines_read += len(lines)
+                            if lines_read // 1000 > previous // 1000:
+                                console.print(f"[cyan]Subfinder: {lines_read} satır okundu, {len(self.subdomains)} subdomain bulundu[/cyan]")
+                                logging.info(f"Subfinder: {lines_read} satır okundu, {len(self.subdomains)} subdomain bulundu")
+                            progress.advance(task, advance=len(lines))
+                        if buffer:
+                            self._add_subfinder_lines([buffer.decode(errors="replace")])
                             progress.advance(task, advance=1)
                 except asyncio.TimeoutError:
                     console.print(f"[yellow]Subfinder {self.subfinder_timeout} saniyede tamamlanamadı, zorla durduruldu.[/yellow]")
@@ -108,22 +212,20 @@ class Tulpar:
                 if process.returncode == 0 or self.subdomains:
                     console.print("[bold green]Subfinder taraması tamamlandı.[/bold green]")
                     if os.path.exists(subfinder_output):
-                        with open(subfinder_output, "r") as f:
-                            for line in f:
-                                subdomain = line.strip()
-                                if subdomain and subdomain.endswith(self.domain):
-                                    self.subdomains.add(subdomain)
+                        for subdomain in await asyncio.to_thread(self._read_lines, subfinder_output):
+                            if subdomain.endswith(self.domain):
+                                self.subdomains.add(subdomain)
+                                if self.verbose:
                                     console.print(f"[cyan]Subfinder Dosya Bulundu: {subdomain}[/cyan]")
                                     logging.info(f"Subfinder dosya subdomain bulundu: {subdomain}")
                 else:
                     console.print(f"[yellow]Subfinder başarısız, return code: {process.returncode}. Dosyadan subdomain okunuyor.[/yellow]")
                     logging.warning(f"Subfinder başarısız, return code: {process.returncode}")
                     if os.path.exists(subfinder_output):
-                        with open(subfinder_output, "r") as f:
-                            for line in f:
-                                subdomain = line.strip()
-                                if subdomain and subdomain.endswith(self.domain):
-                                    self.subdomains.add(subdomain)
+                        for subdomain in await asyncio.to_thread(self._read_lines, subfinder_output):
+                            if subdomain.endswith(self.domain):
+                                self.subdomains.add(subdomain)
+                                if self.verbose:
                                     console.print(f"[cyan]Subfinder Dosya Bulundu: {subdomain}[/cyan]")
                                     logging.info(f"Subfinder dosya subdomain bulundu: {subdomain}")
         except Exception as e:
@@ -132,134 +234,151 @@ class Tulpar:
 
         console.print(f"[bold green]Toplam {len(self.subdomains)} subdomain bulundu.[/bold green]")
 
-    async def check_live_subdomains(self):
+    def _add_subfinder_lines(self, lines):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if self.verbose:
+                console.print(f"[cyan]Subfinder Çıktısı: {line}[/cyan]")
+                logging.info(f"Subfinder çıktısı: {line}")
+            if line.endswith(self.domain):
+                self.subdomains.add(line)
+                if self.verbose:
+                    console.print(f"[cyan]Subfinder Bulundu: {line}[/cyan]")
+                    logging.info(f"Subfinder subdomain bulundu: {line}")
+
+    async def resolve_subdomains(self):
+        console.print("[bold green]Subdomain'ler çözümleniyor (DNS)...[/bold green]")
+        subdomains = list(self.subdomains)
+        try:
+            resolver = aiodns.DNSResolver()
+        except Exception as e:
+            console.print(f"[yellow]DNS çözümleme hatası, tüm subdomain'ler kontrol edilecek: {str(e)}[/yellow]")
+            logging.warning(f"DNS çözümleme hatası: {str(e)}")
+            self.resolved_subdomains = set(subdomains)
+            return
+        semaphore = asyncio.Semaphore(self.dns_concurrency)
+        results = await asyncio.gather(*(self._resolve(resolver, semaphore, subdomain) for subdomain in subdomains))
+        self.resolved_subdomains = {subdomain for subdomain, keep in zip(subdomains, results) if keep}
+        console.print(f"[bold green]{len(self.resolved_subdomains)}/{len(subdomains)} subdomain çözümlendi.[/bold green]")
+        logging.info(f"{len(self.resolved_subdomains)}/{len(subdomains)} subdomain çözümlendi.")
+
+    async def _resolve(self, resolver, semaphore, subdomain):
+        try:
+            async with semaphore:
+                await resolver.query(subdomain, "A")
+            return True
+        except aiodns.error.DNSError as e:
+            # Yalnızca kesin "kayıt yok" yanıtlarında host elenir; timeout vb. geçici hatalarda tutulur
+            if e.args and e.args[0] in (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA):
+                logging.info(f"DNS çözümlenemedi: {subdomain} - {str(e)}")
+                return False
+            logging.warning(f"DNS hatası, host korunuyor: {subdomain} - {str(e)}")
+            return True
+        except Exception as e:
+            logging.warning(f"DNS hatası, host korunuyor: {subdomain} - {str(e)}")
+            return True
+
+    async def check_live_subdomains(self, session):
         console.print("[bold green]Live host kontrolü başlatılıyor...[/bold green]")
-        headers = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=50, ssl=False), headers=headers) as session:
-            tasks = []
-            for subdomain in self.subdomains:
-                console.print(f"[yellow]Kontrol ediliyor: {subdomain}[/yellow]")
-                tasks.append(self._check_live(session, subdomain))
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TimeRemainingColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("Live host kontrolü", total=len(tasks))
-                for future in asyncio.as_completed(tasks):
-                    await future
-                    progress.advance(task)
-                    await asyncio.sleep(self.rate_limit)
+        tasks = []
+        for subdomain in self.resolved_subdomains:
+            console.print(f"[yellow]Kontrol ediliyor: {subdomain}[/yellow]")
+            tasks.append(self._check_live(session, subdomain))
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            transient=True
+        ) as progress:
+            task = progress.add_task("Live host kontrolü", total=len(tasks))
+            for future in asyncio.as_completed(tasks):
+                await future
+                progress.advance(task)
         console.print(f"[bold green]{len(self.live_subdomains)} canlı subdomain bulundu.[/bold green]")
         logging.info(f"{len(self.live_subdomains)} canlı subdomain bulundu.")
 
     async def _check_live(self, session, subdomain):
-        for protocol in ["http", "https"]:
-            try:
-                async with session.get(
-                    f"{protocol}://{subdomain}",
-                    timeout=15
-                ) as resp:
-                    if resp.status < 400:
-                        live_url = f"{protocol}://{subdomain}"
-                        self.live_subdomains.add(live_url)
-                        console.print(f"[cyan]Canlı: {live_url} (Status: {resp.status})[/cyan]")
-                        logging.info(f"Canlı subdomain: {live_url} (Status: {resp.status})")
-                        await self._take_screenshot(live_url)
+        async with self._semaphore:
+            for protocol in ["http", "https"]:
+                url = f"{protocol}://{subdomain}"
+                try:
+                    async with session.head(url, allow_redirects=True) as resp:
+                        status = resp.status
+                    # HEAD isteğini engelleyen sunucular için gövdesi kısıtlanmış GET
+                    if status in (403, 405):
+                        async with session.get(url, headers=RANGE_HEADERS) as resp:
+                            status = resp.status
+                    if status < 400:
+                        self.live_subdomains.add(url)
+                        console.print(f"[cyan]Canlı: {url} (Status: {status})[/cyan]")
+                        logging.info(f"Canlı subdomain: {url} (Status: {status})")
+                        await self._take_screenshot(url)
                         return
                     else:
-                        console.print(f"[yellow]Hata: {protocol}://{subdomain} - Status: {resp.status}[/yellow]")
-                        logging.warning(f"Live host kontrol hatası: {protocol}://{subdomain} - Status: {resp.status}")
-            except Exception as e:
-                console.print(f"[yellow]Hata: {protocol}://{subdomain} - {str(e) or 'Bilinmeyen hata'}[/yellow]")
-                logging.warning(f"Live host kontrol hatası: {protocol}://{subdomain} - {str(e) or 'Bilinmeyen hata'}")
-        headers = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
-        for protocol in ["http", "https"]:
-            try:
-                resp = requests.head(f"{protocol}://{subdomain}", timeout=15, allow_redirects=True, headers=headers, verify=False)
-                if resp.status_code < 400:
-                    live_url = f"{protocol}://{subdomain}"
-                    self.live_subdomains.add(live_url)
-                    console.print(f"[cyan]Canlı (yedek): {live_url} (Status: {resp.status_code})[/cyan]")
-                    logging.info(f"Canlı subdomain (yedek): {live_url} (Status: {resp.status_code})")
-                    await self._take_screenshot(live_url)
-                    return
-                else:
-                    console.print(f"[yellow]Hata (yedek): {protocol}://{subdomain} - Status: {resp.status_code}[/yellow]")
-                    logging.warning(f"Live host kontrol hatası (yedek): {protocol}://{subdomain} - Status: {resp.status_code}")
-            except Exception as e:
-                console.print(f"[yellow]Hata (yedek): {protocol}://{subdomain} - {str(e) or 'Bilinmeyen hata'}[/yellow]")
-                logging.warning(f"Live host kontrol hatası (yedek): {protocol}://{subdomain} - {str(e) or 'Bilinmeyen hata'}")
+                        console.print(f"[yellow]Hata: {url} - Status: {status}[/yellow]")
+                        logging.warning(f"Live host kontrol hatası: {url} - Status: {status}")
+                except Exception as e:
+                    console.print(f"[yellow]Hata: {url} - {str(e) or 'Bilinmeyen hata'}[/yellow]")
+                    logging.warning(f"Live host kontrol hatası: {url} - {str(e) or 'Bilinmeyen hata'}")
 
     async def _take_screenshot(self, url):
         try:
-            headers = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
-            response = requests.get(url, timeout=15, headers=headers, verify=False)
-            img = Image.new("RGB", (800, 600), color="white")
-            img.save(f"{self.output_dir}/screenshot_{urlparse(url).netloc}.png")
-            self.screenshots[url] = f"screenshot_{urlparse(url).netloc}.png"
+            filename = f"screenshot_{urlparse(url).netloc}.png"
+            await asyncio.to_thread(shutil.copyfile, self._placeholder, f"{self.output_dir}/{filename}")
+            self.screenshots[url] = filename
             logging.info(f"Screenshot alındı: {url}")
         except Exception as e:
             console.print(f"[yellow]Screenshot hatası: {url} - {str(e)}[/yellow]")
             logging.warning(f"Screenshot hatası: {url} - {str(e)}")
 
-    async def collect_js_endpoints(self):
+    async def collect_js_endpoints(self, session):
         console.print("[bold green]JavaScript dosyalarından endpoint'ler toplanıyor...[/bold green]")
-        headers = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=50, ssl=False), headers=headers) as session:
-            for url in self.live_subdomains:
-                try:
-                    async with session.get(url, timeout=15) as resp:
-                        if resp.status >= 400:
-                            continue
-                        html = await resp.text()
-                        js_urls = re.findall(r'<script[^>]+src=["\'](.*?)["\']', html, re.IGNORECASE)
-                        for js_url in js_urls:
-                            js_url = urljoin(url, js_url)
-                            if urlparse(js_url).netloc.endswith(self.domain):
-                                try:
-                                    async with session.get(js_url, timeout=15) as js_resp:
-                                        if js_resp.status >= 400:
-                                            continue
-                                        js_content = await js_resp.text()
-                                        endpoints = re.findall(
-                                            r'[\'"](https?://[^"\']+?)[\'"]|[\'"](/[^"\']+?)[\'"]|[\'"](api/[^"\']+?)[\'"]|'
-                                            r'[\'"](graphql/[^"\']+?)[\'"]|[\'"](ws://[^"\']+?)[\'"]|[\'"]([^"\']+?\?[^"\']+?)[\'"]|'
-                                            r'[\'"]([^"\']+?/[a-zA-Z0-9_-]+?/[0-9a-zA-Z_-]+?)[\'"]',
-                                            js_content
-                                        )
-                                        for endpoint_group in endpoints:
-                                            endpoint = next((e for e in endpoint_group if e), None)
-                                            if not endpoint:
-                                                continue
-                                            if endpoint.startswith('/'):
-                                                endpoint = urljoin(url, endpoint)
-                                            if urlparse(endpoint).netloc.endswith(self.domain):
-                                                parsed = urlparse(endpoint)
-                                                params = parse_qs(parsed.query)
-                                                param_count = len(params)
-                                                param_names = list(params.keys())
-                                                self.js_endpoints.append({
-                                                    "url": endpoint,
-                                                    "parameters": param_count,
-                                                    "param_names": param_names
-                                                })
-                                                console.print(f"[cyan]JS Endpoint: {endpoint} (Parametre: {param_count}, İsimler: {param_names})[/cyan]")
-                                                logging.info(f"JS endpoint: {endpoint} (Parametre: {param_count}, İsimler: {param_names})")
-                                except Exception as e:
-                                    console.print(f"[yellow]JS dosyası hatası: {js_url} - {str(e)}[/yellow]")
-                                    logging.warning(f"JS dosyası hatası: {js_url} - {str(e)}")
-                except Exception as e:
-                    console.print(f"[yellow]JS endpoint toplama hatası: {url} - {str(e)}[/yellow]")
-                    logging.warning(f"JS endpoint toplama hatası: {url} - {str(e)}")
-                await asyncio.sleep(self.rate_limit)
+        await asyncio.gather(*(self._collect_js(session, url) for url in self.live_subdomains))
         console.print(f"[bold green]{len(self.js_endpoints)} JS endpoint bulundu.[/bold green]")
 
-    async def test_vulnerabilities(self):
+    async def _collect_js(self, session, url):
+        try:
+            async with self._semaphore:
+                async with session.get(url) as resp:
+                    if resp.status >= 400:
+                        return
+                    html = await self._read_text(resp, MAX_HTML_BYTES)
+        except Exception as e:
+            console.print(f"[yellow]JS endpoint toplama hatası: {url} - {str(e)}[/yellow]")
+            logging.warning(f"JS endpoint toplama hatası: {url} - {str(e)}")
+            return
+        js_urls = SCRIPT_SRC_RE.findall(html)
+        for js_url in js_urls:
+            try:
+                js_url = urljoin(url, js_url)
+                if js_url in self._fetched_js or not self._belongs(urlparse(js_url).hostname):
+                    continue
+                self._fetched_js.add(js_url)
+                async with self._semaphore:
+                    async with session.get(js_url) as js_resp:
+                        if js_resp.status >= 400:
+                            continue
+                        js_content = await self._read_text(js_resp, MAX_JS_BYTES)
+                for match in JS_ENDPOINT_RE.finditer(js_content):
+                    endpoint = match.group("u")
+                    if endpoint.startswith('/'):
+                        endpoint = urljoin(url, endpoint)
+                    if endpoint in self.js_endpoints:
+                        continue
+                    parsed = urlparse(endpoint)
+                    if self._belongs(parsed.hostname):
+                        self.js_endpoints[endpoint] = parsed.query
+                        console.print(f"[cyan]JS Endpoint: {endpoint}[/cyan]")
+                        logging.info(f"JS endpoint: {endpoint}")
+            except Exception as e:
+                console.print(f"[yellow]JS dosyası hatası: {js_url} - {str(e)}[/yellow]")
+                logging.warning(f"JS dosyası hatası: {js_url} - {str(e)}")
+
+    async def test_vulnerabilities(self, session):
         console.print("[bold green]Zafiyet testleri başlatılıyor...[/bold green]")
-        headers = {"User-Agent": "Tulpar/1.0 (BugBountyScanner)"}
         payloads = {
             "openredirect": [
                 "https://evil.com", "//evil.com", "http://evil.com",
@@ -277,142 +396,227 @@ class Tulpar:
                 "{{7*7}}", "${7*7}", "<%= 7*7 %>", "{{ '7' * 7 }}"
             ]
         }
+        # Zaten URL-encode edilmiş payload'lar, tekrar encode edilmeden gönderilir
+        encoded_payloads = {"..%2f..%2f..%2fetc%2fpasswd", "%2e%2e%2f%2e%2e%2fwindows%2fwin.ini"}
         params = ["q", "search", "id", "page", "redirect", "url", "path", "file", "template"]
         
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=50, ssl=False), headers=headers) as session:
-            for url in self.live_subdomains:
-                parsed_url = urlparse(url)
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                for vuln_type, payload_list in payloads.items():
-                    for payload in payload_list:
-                        for param in params:
-                            test_url = f"{base_url}?{param}={payload}"
-                            try:
-                                async with session.get(test_url, timeout=15, allow_redirects=False) as resp:
-                                    response_text = await resp.text()
-                                    if vuln_type == "openredirect" and (resp.status in [301, 302] and re.search(r'https?://(www\.)?evil\.com', resp.headers.get("Location", ""))):
-                                        self.vulnerabilities.append({
-                                            "type": "openredirect",
-                                            "url": test_url,
-                                            "payload": payload,
-                                            "severity": "medium"
-                                        })
-                                        console.print(f"[red]Zafiyet Bulundu: Open Redirect - {test_url} - Payload: {payload}[/red]")
-                                        logging.info(f"Open Redirect bulundu: {test_url} - Payload: {payload}")
-                                    elif vuln_type == "pathtraversal" and ("root:" in response_text or "[extensions]" in response_text):
-                                        self.vulnerabilities.append({
-                                            "type": "pathtraversal",
-                                            "url": test_url,
-                                            "payload": payload,
-                                            "severity": "high"
-                                        })
-                                        console.print(f"[red]Zafiyet Bulundu: Path Traversal - {test_url} - Payload: {payload}[/red]")
-                                        logging.info(f"Path Traversal bulundu: {test_url} - Payload: {payload}")
-                                    elif vuln_type == "xss" and any(p in response_text.lower() for p in ["alert(1)", "onerror"]):
-                                        self.vulnerabilities.append({
-                                            "type": "xss",
-                                            "url": test_url,
-                                            "payload": payload,
-                                            "severity": "high"
-                                        })
-                                        console.print(f"[red]Zafiyet Bulundu: XSS - {test_url} - Payload: {payload}[/red]")
-                                        logging.info(f"XSS bulundu: {test_url} - Payload: {payload}")
-                                    elif vuln_type == "ssti" and any(str(49) in response_text or "7777777" in response_text):
-                                        self.vulnerabilities.append({
-                                            "type": "ssti",
-                                            "url": test_url,
-                                            "payload": payload,
-                                            "severity": "critical"
-                                        })
-                                        console.print(f"[red]Zafiyet Bulundu: SSTI - {test_url} - Payload: {payload}[/red]")
-                                        logging.info(f"SSTI bulundu: {test_url} - Payload: {payload}")
-                            except Exception as e:
-                                console.print(f"[yellow]Zafiyet testi hatası: {test_url} - {str(e)}[/yellow]")
-                                logging.warning(f"Zafiyet testi hatası: {test_url} - {str(e)}")
-                            await asyncio.sleep(self.rate_limit)
+        combinations = frozenset(
+            (vuln_type, payload, param)
+            for vuln_type, payload_list in payloads.items()
+            for payload in payload_list
+            for param in params
+        )
+        hosts = [
+            (parsed_url, URL(f"{parsed_url.scheme}://{parsed_url.netloc}"))
+            for parsed_url in map(urlparse, self.live_subdomains)
+        ]
+        # Hostlar iç döngüde: ardışık istekler farklı hostlara gider, tek host bağlantı havuzunu tıkamaz
+        test_urls = {}
+        for vuln_type, payload, param in combinations:
+            for parsed_url, base_url in hosts:
+                if payload in encoded_payloads:
+                    test_url = URL.build(
+                        scheme=parsed_url.scheme,
+                        host=parsed_url.hostname,
+                        port=parsed_url.port,
+                        query_string=f"{param}={payload}",
+                        encoded=True
+                    )
+                else:
+                    test_url = base_url.with_query({param: payload})
+                test_urls.setdefault((vuln_type, test_url), (payload, param))
+        await asyncio.gather(*(
+            self._probe(session, vuln_type, payload, param, test_url)
+            for (vuln_type, test_url), (payload, param) in test_urls.items()
+        ))
         console.print(f"[bold green]{len(self.vulnerabilities)} zafiyet bulundu.[/bold green]")
 
-    async def collect_wayback_endpoints(self):
+    async def _probe(self, session, vuln_type, payload, param, test_url):
+        try:
+            async with self._semaphore, session.get(test_url, allow_redirects=False) as resp:
+                status = resp.status
+                location = resp.headers.get("Location", "")
+                response_text = await self._read_text(resp, MAX_HTML_BYTES)
+            if vuln_type == "openredirect" and (status in [301, 302] and REDIRECT_RE.search(location)):
+                self.vulnerabilities.append({
+                    "type": "openredirect",
+                    "url": str(test_url),
+                    "payload": payload,
+                    "severity": "medium"
+                })
+                console.print(f"[red]Zafiyet Bulundu: Open Redirect - {test_url} - Payload: {payload}[/red]")
+                logging.info(f"Open Redirect bulundu: {test_url} - Payload: {payload}")
+            elif vuln_type == "pathtraversal" and PATHTRAVERSAL_RE.search(response_text):
+                self.vulnerabilities.append({
+                    "type": "pathtraversal",
+                    "url": str(test_url),
+                    "payload": payload,
+                    "severity": "high"
+                })
+                console.print(f"[red]Zafiyet Bulundu: Path Traversal - {test_url} - Payload: {payload}[/red]")
+                logging.info(f"Path Traversal bulundu: {test_url} - Payload: {payload}")
+            elif vuln_type == "xss" and XSS_RE.search(response_text):
+                self.vulnerabilities.append({
+                    "type": "xss",
+                    "url": str(test_url),
+                    "payload": payload,
+                    "severity": "high"
+                })
+                console.print(f"[red]Zafiyet Bulundu: XSS - {test_url} - Payload: {payload}[/red]")
+                logging.info(f"XSS bulundu: {test_url} - Payload: {payload}")
+            elif (
+                vuln_type == "ssti" and SSTI_RE.search(response_text)
+                and not await self._ssti_control(session, test_url.with_query({param: "7"}))
+            ):
+                self.vulnerabilities.append({
+                    "type": "ssti",
+                    "url": str(test_url),
+                    "payload": payload,
+                    "severity": "critical"
+                })
+                console.print(f"[red]Zafiyet Bulundu: SSTI - {test_url} - Payload: {payload}[/red]")
+                logging.info(f"SSTI bulundu: {test_url} - Payload: {payload}")
+        except Exception as e:
+            console.print(f"[yellow]Zafiyet testi hatası: {test_url} - {str(e)}[/yellow]")
+            logging.warning(f"Zafiyet testi hatası: {test_url} - {str(e)}")
+
+    async def _ssti_control(self, session, control_url):
+        # Sayfada zaten 49/7777777 geçiyorsa (fiyat, ID, 49px vb.) eşleşme SSTI sayılmaz
+        task = self._ssti_controls.get(control_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_ssti_control(session, control_url))
+            self._ssti_controls[control_url] = task
+        return await task
+
+    async def _fetch_ssti_control(self, session, control_url):
+        try:
+            async with self._semaphore, session.get(control_url, allow_redirects=False) as resp:
+                return bool(SSTI_RE.search(await self._read_text(resp, MAX_HTML_BYTES)))
+        except Exception as e:
+            # Kontrol yanıtı alınamazsa bulgu doğrulanamaz, raporlanmaz
+            logging.warning(f"SSTI kontrol isteği hatası: {control_url} - {str(e)}")
+            return True
+
+    async def collect_wayback_endpoints(self, session):
         console.print("[bold green]Wayback Machine taranıyor...[/bold green]")
+        params = {
+            "url": self.domain,
+            "matchType": "domain",
+            "output": "json",
+            "fl": "original",
+            "collapse": "urlkey",
+            "limit": str(WAYBACK_PAGE_SIZE),
+            "showResumeKey": "true"
+        }
+        page = 0
         try:
-            wayback = waybackpy.WaybackMachineCDXServerAPI(self.domain, user_agent="Tulpar/1.0")
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TimeRemainingColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("Wayback endpoint'leri toplanıyor", total=None)
-                for snapshot in wayback.snapshots():
+            while True:
+                page += 1
+                async with session.get(
+                    "https://web.archive.org/cdx/search/cdx",
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=120)
+                ) as resp:
+                    if resp.status >= 400:
+                        raise Exception(f"CDX API Status: {resp.status} (sayfa {page})")
+                    rows = await resp.json(content_type=None)
+                # İlk satır sütun başlıklarını, sonraki sayfa varsa son iki satır [] ve [resumeKey] içerir
+                resume_key = None
+                if len(rows) >= 2 and rows[-2] == [] and rows[-1]:
+                    resume_key = rows[-1][0]
+                    rows = rows[:-2]
+                for row in rows[1:]:
                     try:
-                        url = snapshot.url
-                        if urlparse(url).netloc.endswith(self.domain):
+                        url = row[0]
+                        if self._belongs(urlparse(url).hostname):
                             self.endpoints.add(url)
                             console.print(f"[cyan]Wayback Endpoint: {url}[/cyan]")
                             logging.info(f"Wayback endpoint: {url}")
                     except Exception as e:
                         console.print(f"[yellow]Wayback URL hatası: {str(e)}[/yellow]")
                         logging.warning(f"Wayback URL hatası: {str(e)}")
-                    progress.advance(task, advance=1)
-                    await asyncio.sleep(self.rate_limit)
-            console.print(f"[bold green]{len(self.endpoints)} Wayback endpoint bulundu.[/bold green]")
+                if not resume_key:
+                    break
+                params["resumeKey"] = resume_key
         except Exception as e:
+            # Önceki sayfalardan toplanan endpoint'ler korunur
             console.print(f"[bold red]Wayback hatası: {str(e)}[/bold red]")
             logging.error(f"Wayback hatası: {str(e)}")
+        console.print(f"[bold green]{len(self.endpoints)} Wayback endpoint bulundu.[/bold green]")
+
+    def _endpoint_rows(self, js_endpoint_data):
+        rows = [
+            (endpoint, "Wayback", len(parse_qs(urlparse(endpoint).query)))
+            for endpoint in self.endpoints
+        ]
+        rows.extend((data["url"], "JavaScript", data["parameters"]) for data in js_endpoint_data)
+        return rows
+
+    def _table_fits(self, title, row_count, export_path=None):
+        if self.show_tables or row_count <= MAX_TABLE_ROWS:
+            return True
+        export_path = export_path or f"{self.output_base}.json"
+        console.print(f"[yellow]{title}: {row_count} satır, tablo gösterilmedi (--table ile gösterilebilir). Ayrıntılar: {export_path}[/yellow]")
+        return False
 
     async def save_results(self):
-        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
-        output_base = f"{self.output_dir}/tulpar_output_{self.domain}_{timestamp}"
+        output_base = self.output_base
+        js_endpoint_data = [self._js_endpoint_data(url, query) for url, query in self.js_endpoints.items()]
         results = {
             "domain": self.domain,
             "subdomains": list(self.subdomains),
             "live_subdomains": list(self.live_subdomains),
             "wayback_endpoints": list(self.endpoints),
-            "js_endpoints": self.js_endpoints,
+            "js_endpoints": js_endpoint_data,
             "vulnerabilities": self.vulnerabilities,
             "screenshots": self.screenshots,
             "support": "Tulpar'ı beğendiyseniz, bir kahve ısmarlayın: https://www.buymeacoffee.com/emrewashere"
         }
-        with open(f"{output_base}.json", "w") as f:
-            json.dump(results, f, indent=4)
-        console.print(f"[bold green]Sonuçlar kaydedildi: {output_base}.json[/bold green]")
+        await asyncio.to_thread(self._write_json, f"{output_base}.json", results)
+        await asyncio.to_thread(
+            self._write_csv,
+            f"{output_base}_endpoints.csv",
+            ["Endpoint", "Kaynak", "Parametre Sayısı"],
+            self._endpoint_rows(js_endpoint_data)
+        )
+        console.print(f"[bold green]Sonuçlar kaydedildi: {output_base}.json, {output_base}_endpoints.csv[/bold green]")
 
     def display_results(self):
         # Subdomain Tablosu
-        sub_table = Table(title="Subdomain'ler")
-        sub_table.add_column("Subdomain", style="cyan")
-        sub_table.add_column("Canlı", style="green")
-        for subdomain in self.subdomains:
-            live = "Evet" if any(subdomain in url for url in self.live_subdomains) else "Hayır"
-            sub_table.add_row(subdomain, live)
-        console.print(sub_table)
+        if self._table_fits("Subdomain'ler", len(self.subdomains)):
+            sub_table = Table(title="Subdomain'ler")
+            sub_table.add_column("Subdomain", style="cyan")
+            sub_table.add_column("Canlı", style="green")
+            live_hosts = {urlparse(url).netloc for url in self.live_subdomains}
+            for subdomain in self.subdomains:
+                live = "Evet" if subdomain in live_hosts else "Hayır"
+                sub_table.add_row(subdomain, live)
+            console.print(sub_table)
 
         # JS Endpoint Tablosu
-        js_table = Table(title="JavaScript Endpoint'ler")
-        js_table.add_column("Endpoint", style="cyan")
-        js_table.add_column("Parametre Sayısı", style="yellow")
-        js_table.add_column("Parametre İsimleri", style="magenta")
-        for endpoint_data in self.js_endpoints:
-            js_table.add_row(
-                endpoint_data["url"],
-                str(endpoint_data["parameters"]),
-                ", ".join(endpoint_data["param_names"]) or "Yok"
-            )
-        console.print(js_table)
+        js_endpoint_data = [self._js_endpoint_data(url, query) for url, query in self.js_endpoints.items()]
+        if self._table_fits("JavaScript Endpoint'ler", len(js_endpoint_data), f"{self.output_base}_endpoints.csv"):
+            js_table = Table(title="JavaScript Endpoint'ler")
+            js_table.add_column("Endpoint", style="cyan")
+            js_table.add_column("Parametre Sayısı", style="yellow")
+            js_table.add_column("Parametre İsimleri", style="magenta")
+            for endpoint_data in js_endpoint_data:
+                js_table.add_row(
+                    endpoint_data["url"],
+                    str(endpoint_data["parameters"]),
+                    ", ".join(endpoint_data["param_names"]) or "Yok"
+                )
+            console.print(js_table)
 
         # Tüm Endpoint Tablosu
-        endpoint_table = Table(title="Tüm Endpoint'ler")
-        endpoint_table.add_column("Endpoint", style="cyan")
-        endpoint_table.add_column("Kaynak", style="green")
-        endpoint_table.add_column("Parametre Sayısı", style="yellow")
-        for endpoint in self.endpoints:
-            parsed = urlparse(endpoint)
-            param_count = len(parse_qs(parsed.query))
-            endpoint_table.add_row(endpoint, "Wayback", str(param_count))
-        for endpoint_data in self.js_endpoints:
-            endpoint_table.add_row(endpoint_data["url"], "JavaScript", str(endpoint_data["parameters"]))
-        console.print(endpoint_table)
+        if self._table_fits("Tüm Endpoint'ler", len(self.endpoints) + len(js_endpoint_data), f"{self.output_base}_endpoints.csv"):
+            endpoint_table = Table(title="Tüm Endpoint'ler")
+            endpoint_table.add_column("Endpoint", style="cyan")
+            endpoint_table.add_column("Kaynak", style="green")
+            endpoint_table.add_column("Parametre Sayısı", style="yellow")
+            for endpoint, source, param_count in self._endpoint_rows(js_endpoint_data):
+                endpoint_table.add_row(endpoint, source, str(param_count))
+            console.print(endpoint_table)
 
         # Özet Tablosu
         summary_table = Table(title="Tulpar Özet")
@@ -429,11 +633,13 @@ class Tulpar:
 def parse_args():
     parser = argparse.ArgumentParser(description="Tulpar - Subdomain ve Zafiyet Tarama Aracı")
     parser.add_argument("-d", "--domain", required=True, help="Hedef domain (örn: example.com)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Subfinder çıktısını satır satır göster")
+    parser.add_argument("--table", action="store_true", help="Büyük sonuç tablolarını da konsola bas")
     return parser.parse_args()
 
 async def main():
     args = parse_args()
-    tulpar = Tulpar(args.domain)
+    tulpar = Tulpar(args.domain, verbose=args.verbose, show_tables=args.table)
     await tulpar.run()
 
 if __name__ == "__main__":